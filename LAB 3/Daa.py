@@ -1,5 +1,10 @@
 # Modules
+import bisect
 import random
+import tracemalloc
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 
 
@@ -35,6 +40,205 @@ class Employee:
         return f"ID: {self.id_no}, Name: {self.name}, Gross: {self.gross}, Net: {self.net}"
 
 
+class CompactEmployee:
+    """Employee without a per-instance __dict__, for holding millions of records."""
+
+    __slots__ = ("id_no", "name", "basic", "gross", "net")
+
+    def __init__(self, id_no, name, basic, gross=0, net=0):
+        self.id_no = id_no
+        self.name = name
+        self.basic = basic
+        self.gross = gross
+        self.net = net
+
+    # Same salary rules and output as Employee
+    calc_salary = Employee.calc_salary
+    display = Employee.display
+
+
+class EmployeeTable:
+    """Stores employees as columns: typed arrays for id, basic, gross and net plus an interned name table."""
+
+    def __init__(self):
+        self.id_no = array("q")
+        self.basic = array("d")
+        self.gross = array("d")
+        self.net = array("d")
+        self.name_ids = array("I")
+        self.names = []  # Each distinct name is stored once
+        self.name_index = {}
+
+    def __len__(self):
+        return len(self.id_no)
+
+    def __getitem__(self, i):
+        return CompactEmployee(self.id_no[i], self.names[self.name_ids[i]], self.basic[i], self.gross[i], self.net[i])
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def intern_name(self, name):
+        """Returns the name table index of a name, adding it if it is new."""
+
+        if name not in self.name_index:
+            self.name_index[name] = len(self.names)
+            self.names.append(name)
+        return self.name_index[name]
+
+    def append(self, id_no, name, basic, gross=0, net=0):
+        """Adds one employee record."""
+
+        self.id_no.append(id_no)
+        self.name_ids.append(self.intern_name(name))
+        self.basic.append(basic)
+        self.gross.append(gross)
+        self.net.append(net)
+
+    def calc_salary(self):
+        """Calculate gross and net salary for every employee in the table."""
+
+        gross, net = calc_salaries(np.frombuffer(self.basic, dtype=np.float64))
+        self.gross = array("d", gross.tobytes())
+        self.net = array("d", net.tobytes())
+
+    def display(self, i):
+        """Returns the gross and net salary of the i-th employee."""
+
+        return self[i].display()
+
+    def columns(self):
+        """Returns NumPy views (no copies) of the id, basic, gross and net columns."""
+
+        return (np.frombuffer(self.id_no, dtype=np.int64), np.frombuffer(self.basic, dtype=np.float64),
+                np.frombuffer(self.gross, dtype=np.float64), np.frombuffer(self.net, dtype=np.float64))
+
+    @classmethod
+    def from_payroll(cls, payroll):
+        """Builds a table from a payroll data frame returned by read_payroll."""
+
+        table = cls()
+        table.id_no = array("q", payroll["ID"].to_numpy(dtype=np.int64).tobytes())
+        table.basic = array("d", payroll["Basic"].to_numpy(dtype=np.float64).tobytes())
+        table.gross = array("d", payroll["Gross"].to_numpy(dtype=np.float64).tobytes())
+        table.net = array("d", payroll["Net"].to_numpy(dtype=np.float64).tobytes())
+        table.name_ids = array("I", (table.intern_name(name) for name in payroll["Name"].tolist()))
+        return table
+
+
+def memory_benchmark(n=100000, distinct_names=2000):
+    """Prints the bytes per record used by Employee, CompactEmployee and EmployeeTable for n employees."""
+
+    names = [f"Employee {i}" for i in range(distinct_names)]
+
+    def build_objects(cls):
+        return [cls(i, names[i % distinct_names], 1000.0 + i, 2000.0 + i, 1500.0 + i) for i in range(n)]
+
+    def build_table():
+        table = EmployeeTable()
+        for i in range(n):
+            table.append(i, names[i % distinct_names], 1000.0 + i, 2000.0 + i, 1500.0 + i)
+        return table
+
+    for label, build in (("Employee", lambda: build_objects(Employee)),
+                         ("CompactEmployee", lambda: build_objects(CompactEmployee)),
+                         ("EmployeeTable", build_table)):
+        tracemalloc.start()
+        records = build()
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label}: {used / n:.1f} bytes per record")
+        del records
+
+
+class EmployeeStore:
+    """Keeps employees indexed by ID and sorted by gross and net salary for fast reporting queries."""
+
+    fields = ("gross", "net")
+
+    def __init__(self, employees=()):
+        self.by_id = {}
+        # Each sorted index is a pair of parallel lists: salary keys and the matching employees
+        self.keys = {field: [] for field in self.fields}
+        self.sorted = {field: [] for field in self.fields}
+
+        employees = list(employees)
+        for emp in employees:
+            self.by_id[emp.id_no] = emp
+
+        for field in self.fields:
+            ordered = sorted(self.by_id.values(), key=lambda emp: getattr(emp, field))
+            self.sorted[field] = ordered
+            self.keys[field] = [getattr(emp, field) for emp in ordered]
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def add(self, emp):
+        """Adds an employee (replacing any with the same ID) and keeps every index sorted."""
+
+        if emp.id_no in self.by_id:
+            self.remove(emp.id_no)
+
+        self.by_id[emp.id_no] = emp
+        for field in self.fields:
+            pos = bisect.bisect_right(self.keys[field], getattr(emp, field))
+            self.keys[field].insert(pos, getattr(emp, field))
+            self.sorted[field].insert(pos, emp)
+
+    def remove(self, id_no):
+        """Removes and returns the employee with the given ID."""
+
+        emp = self.by_id.pop(id_no)
+        for field in self.fields:
+            pos = bisect.bisect_left(self.keys[field], getattr(emp, field))
+            while self.sorted[field][pos] is not emp:
+                pos += 1
+            del self.keys[field][pos]
+            del self.sorted[field][pos]
+
+        return emp
+
+    def get(self, id_no):
+        """Returns the employee with the given ID, or None."""
+
+        return self.by_id.get(id_no)
+
+    def arg_min(self, field="gross"):
+        """Returns every employee sharing the minimum salary of the field."""
+
+        keys = self.keys[field]
+        if not keys:
+            return []
+        return self.sorted[field][:bisect.bisect_right(keys, keys[0])]
+
+    def arg_max(self, field="gross"):
+        """Returns every employee sharing the maximum salary of the field."""
+
+        keys = self.keys[field]
+        if not keys:
+            return []
+        return self.sorted[field][bisect.bisect_left(keys, keys[-1]):]
+
+    def bottom_k(self, k, field="gross"):
+        """Returns the k employees with the lowest salary of the field, lowest first."""
+
+        return self.sorted[field][:max(k, 0)]
+
+    def top_k(self, k, field="gross"):
+        """Returns the k employees with the highest salary of the field, highest first."""
+
+        if k <= 0:
+            return []
+        return self.sorted[field][:-k - 1:-1]
+
+    def salary_range(self, low, high, field="gross"):
+        """Returns the employees whose salary of the field lies between low and high (inclusive), in order."""
+
+        keys = self.keys[field]
+        return self.sorted[field][bisect.bisect_left(keys, low):bisect.bisect_right(keys, high)]
+
+
 def read_data(path):
     """Reads employee data from a CSV file and returns a list of Employee objects."""
 
@@ -72,37 +276,353 @@ def read_data(path):
     return employees, [empty_cells, neg_sal, diff_datatype]
 
 
-def divide(array):
-    """Recursively divides an array to find the minimum and maximum values."""
+def round_salary(values):
+    """Rounds an array of salaries to 2 decimals exactly like the built-in round()."""
+
+    rounded = np.round(values, 2)
 
-    if len(array) == 1:
-        return [array[0], array[0]]
+    # np.round scales by 100 before rounding, so values sitting on a .xx5 tie can land on the other side
+    scaled = values * 100
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) <= np.abs(scaled) * 1e-12 + 1e-12
+    for i in np.flatnonzero(ties):
+        rounded[i] = round(float(values[i]), 2)
 
-    mid = len(array) // 2
+    return rounded
 
-    left, right = array[:mid], array[mid:]
-    min1, max1 = divide(left)
-    min2, max2 = divide(right)
+
+def calc_salaries(basic):
+    """Calculate gross and net salary for a whole column of basic salaries in one pass."""
+
+    basic = np.asarray(basic, dtype=np.float64)
+
+    # Same terms and order of operations as Employee.calc_salary
+    hra = 0.5 * basic
+    da = 0.5 * basic
+    pf = 0.12 * (basic + da)
+    pt = 200
+    travel = 0.1 * basic
+    bonus = (1 / 12) * basic
+    other = 0.2 * basic
+    tax = 0.1 * basic
+
+    gross = round_salary(basic + hra + da + travel + bonus + other)
+    net = round_salary(gross - tax - pf - pt)
+
+    return gross, net
+
+
+def type_mask(column, check, kind):
+    """Returns a boolean mask of the cells in a column that are instances of the given kind."""
+
+    if check(column.dtype) and not pd.api.types.is_bool_dtype(column.dtype):
+        return np.ones(len(column), dtype=bool)
+
+    return np.fromiter((isinstance(value, kind) for value in column), dtype=bool, count=len(column))
+
+
+def validate_frame(df):
+    """Splits a data frame into its valid rows and the [empty cells, non positive, invalid datatype] counts."""
+
+    entries = len(df)
+    df = df.dropna()  # Removes rows with missing entries
+    empty_cells = entries - len(df)
+
+    id_no, names, basic = df[df.columns[0]], df[df.columns[1]], df[df.columns[2]]
+
+    # Check the datatype of the inputs column by column instead of cell by cell
+    valid_type = (type_mask(id_no, pd.api.types.is_integer_dtype, int)
+                  & type_mask(names, pd.api.types.is_string_dtype, str)
+                  & type_mask(basic, pd.api.types.is_float_dtype, float))
+    diff_datatype = int(len(df) - valid_type.sum())
+
+    df = df[valid_type]
+    positive = df[df.columns[2]].to_numpy(dtype=np.float64) > 0  # Removes the non-positive salaries
+    neg_sal = int(len(df) - positive.sum())
+
+    return df[positive], [empty_cells, neg_sal, diff_datatype]
+
+
+def calc_payroll(df):
+    """Returns a payroll frame with ID, Name, Basic, Gross and Net columns for validated rows."""
+
+    basic = df[df.columns[2]].to_numpy(dtype=np.float64)
+    gross, net = calc_salaries(basic)
+
+    return pd.DataFrame({"ID": df[df.columns[0]].to_numpy(), "Name": df[df.columns[1]].to_numpy(),
+                         "Basic": basic, "Gross": gross, "Net": net})
+
+
+def read_payroll(path):
+    """Reads employee data from a CSV file and returns a payroll data frame without building Employee objects."""
+
+    try:
+        df = pd.read_csv(path)
+    except:
+        return calc_payroll(pd.DataFrame(columns=["ID", "Name", "Basic"])), [0, 0, 0]
+
+    valid, errors = validate_frame(df)
+
+    return calc_payroll(valid), errors
+
+
+def column_kind(dtype):
+    """Classifies a column dtype the way read_csv widens it: bool, int, float or object."""
+
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "int"
+    if pd.api.types.is_float_dtype(dtype):
+        return "float"
+    return "object"
+
+
+def infer_column_dtypes(path, chunk_size=100000):
+    """
+    Infers the dtype read_csv would give each column of the whole file, one chunk at a time.
+
+    Chunks are read independently, so a chunk of integer literals would otherwise come back as int64
+    while the whole file is float64; combining the per-chunk kinds gives the whole-file answer.
+    """
+
+    kinds = {}
+    with pd.read_csv(path, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            for column in chunk.columns:
+                kind = column_kind(chunk[column].dtype)
+                seen = kinds.setdefault(column, kind)
+                if seen != kind:
+                    numeric = {seen, kind} == {"int", "float"}
+                    kinds[column] = "float" if numeric else "object"
+
+    return {column: {"bool": "bool", "int": "int64", "float": "float64", "object": str}[kind]
+            for column, kind in kinds.items()}
+
+
+def read_payroll_chunks(path, chunk_size=100000):
+    """Reads employee data from a CSV file in chunks, yielding each chunk's payroll frame and error counts."""
+
+    try:
+        # Pin every chunk to the whole-file dtypes so validation does not depend on the chunk size
+        reader = pd.read_csv(path, chunksize=chunk_size, dtype=infer_column_dtypes(path, chunk_size))
+    except:
+        return  # Nothing to yield if the file does not exist or is empty
+
+    with reader:
+        for chunk in reader:
+            valid, errors = validate_frame(chunk)
+            yield calc_payroll(valid), errors
+
+
+def stream_payroll(path, chunk_size=100000, consumer=None):
+    """
+    Runs payroll over a CSV file one chunk at a time, so peak memory depends on the chunk size and not the file.
+
+    Each chunk's payroll frame is handed to the consumer (if any) and then dropped.
+    Returns the number of valid employees and the error counts summed over all chunks.
+    """
+
+    valid_entries = 0
+    errors = [0, 0, 0]
+
+    for payroll, chunk_errors in read_payroll_chunks(path, chunk_size):
+        valid_entries += len(payroll)
+        errors = [total + count for total, count in zip(errors, chunk_errors)]
+        if consumer is not None:
+            consumer(payroll)
+
+    return valid_entries, errors
+
+
+def to_employees(payroll):
+    """Builds Employee objects from a payroll data frame, only when a caller needs them."""
+
+    return [Employee(id_no, name, basic, gross, net)
+            for id_no, name, basic, gross, net in zip(payroll["ID"].tolist(), payroll["Name"].tolist(),
+                                                      payroll["Basic"].tolist(), payroll["Gross"].tolist(),
+                                                      payroll["Net"].tolist())]
+
+
+def divide(array, low=0, high=None):
+    """Recursively divides an index range of an array to find the minimum and maximum values."""
+
+    if high is None:
+        high = len(array) - 1
+
+    if low == high:
+        return [array[low], array[low]]
+
+    mid = (low + high + 1) // 2
+
+    # Works on index ranges of the same array instead of copying slices
+    min1, max1 = divide(array, low, mid - 1)
+    min2, max2 = divide(array, mid, high)
 
     return [min(min1, min2), max(max1, max2)]
 
 
-def random_sampling(employees):
-    """Selects a random sample of 10 employees and displays the ones with minimum and maximum gross salaries."""
+def min_max(array, low=0, high=None, positions=False):
+    """
+    Finds the minimum and maximum values of an index range with about 3n/2 comparisons and no recursion.
+
+    With positions=True it returns the lists of indices holding the minimum and the maximum instead,
+    including every tie, from the same single pass.
+    """
+
+    if high is None:
+        high = len(array) - 1
+
+    if low > high:
+        raise ValueError("min_max() arg is an empty range")
+
+    # NumPy fast path for float buffers
+    if isinstance(array, np.ndarray) and array.dtype.kind == "f":
+        window = array[low:high + 1]  # A view, not a copy
+        if positions:
+            return [list(np.flatnonzero(window == window.min()) + low),
+                    list(np.flatnonzero(window == window.max()) + low)]
+        return [window.min(), window.max()]
+
+    if positions:
+        return min_max_positions(array, low, high)
+
+    # Start from the first element (odd length) or the first ordered pair (even length)
+    if (high - low + 1) % 2:
+        min_val = max_val = array[low]
+        i = low + 1
+    else:
+        min_val, max_val = (array[low], array[low + 1]) if array[low] < array[low + 1] else (array[low + 1], array[low])
+        i = low + 2
+
+    # Compare each pair once, then only its smaller element to the min and its larger element to the max
+    while i < high:
+        a, b = array[i], array[i + 1]
+        if a > b:
+            a, b = b, a
+        if a < min_val:
+            min_val = a
+        if b > max_val:
+            max_val = b
+        i += 2
+
+    return [min_val, max_val]
+
 
-    employees_list = random.sample(employees, 10)
-    gross_salaries = []
+def min_max_positions(array, low, high):
+    """Pairwise min/max scan of array[low..high] that keeps the index lists of every tying minimum and maximum."""
+
+    if (high - low + 1) % 2:
+        min_val = max_val = array[low]
+        min_pos, max_pos = [low], [low]
+        i = low + 1
+    else:
+        i = low
+        i_small, i_large = (i, i + 1) if array[i] <= array[i + 1] else (i + 1, i)
+        min_val, max_val = array[i_small], array[i_large]
+        min_pos, max_pos = ([i, i + 1], [i, i + 1]) if min_val == max_val else ([i_small], [i_large])
+        i = low + 2
+
+    while i < high:
+        i_small, i_large = (i, i + 1) if array[i] <= array[i + 1] else (i + 1, i)
+        a, b = array[i_small], array[i_large]
+        # Both ends of an equal pair can tie the min or the max; indices stay in ascending order
+        smaller = [i, i + 1] if a == b else [i_small]
+        larger = [i, i + 1] if a == b else [i_large]
+
+        if a < min_val:
+            min_val, min_pos = a, smaller
+        elif a == min_val:
+            min_pos += smaller
+        if b > max_val:
+            max_val, max_pos = b, larger
+        elif b == max_val:
+            max_pos += larger
+        i += 2
+
+    return [min_pos, max_pos]
+
+
+def random_sampling(employees, sample_size=10):
+    """
+    Selects a random sample of employees and displays the ones with minimum and maximum gross salaries.
+
+    A sample_size of None (or one larger than the list) runs over the full employee set.
+    """
+
+    if sample_size is None or sample_size >= len(employees):
+        employees_list = employees
+    else:
+        employees_list = random.sample(employees, sample_size)
+
+    # One pairwise pass over the sample; duplicate IDs are kept, unlike in an EmployeeStore
+    min_positions, max_positions = min_max([i.gross for i in employees_list], positions=True)
+
+    for pos in min_positions:
+        print(f"Min Salary: {employees_list[pos].display()}")
+    for pos in max_positions:
+        print(f"Max Salary: {employees_list[pos].display()}")
+
+
+def process_file(path):
+    """Reads and computes payroll for one file, returning its employee count, errors and min/max gross records."""
+
+    payroll, errors = read_payroll(path)
+    result = {"path": path, "employees": len(payroll), "errors": errors, "min": None, "max": None}
+
+    if len(payroll):
+        gross = payroll["Gross"].to_numpy()
+        for key, pos in (("min", int(gross.argmin())), ("max", int(gross.argmax()))):
+            row = payroll.iloc[pos]
+            result[key] = (int(row["ID"]), row["Name"], float(row["Basic"]), float(row["Gross"]), float(row["Net"]))
+
+    return result
+
+
+def run_batch(paths, workers=None):
+    """
+    Processes many salary files in parallel across a process pool and merges the per-file results.
+
+    Returns a report with the per-file results, the summed error counts and the overall min/max gross employees.
+    """
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        files = list(pool.map(process_file, paths))
+
+    errors = [0, 0, 0]
+    min_emp, max_emp = None, None
+
+    for result in files:
+        errors = [total + count for total, count in zip(errors, result["errors"])]
+        if result["min"] is not None and (min_emp is None or result["min"][3] < min_emp[3]):
+            min_emp = result["min"]
+        if result["max"] is not None and (max_emp is None or result["max"][3] > max_emp[3]):
+            max_emp = result["max"]
+
+    return {"files": files,
+            "employees": sum(result["employees"] for result in files),
+            "errors": errors,
+            "min": CompactEmployee(*min_emp) if min_emp else None,
+            "max": CompactEmployee(*max_emp) if max_emp else None}
 
-    for i in employees_list:
-        gross_salaries.append(i.gross)
 
-    min_sal, max_sal = divide(gross_salaries)
+def print_batch_report(report):
+    """Prints the aggregated report returned by run_batch."""
+
+    for i, result in enumerate(report["files"]):
+        errors = result["errors"]
+        print(f"File {i + 1}: {result['path']}, Valid Employees: {result['employees']}, "
+              f"Empty Cells: {errors[0]}, Non Positive Salaries: {errors[1]}, Invalid Datatypes: {errors[2]}")
+
+    print()
+    print(f"Total Valid Employees: {report['employees']}")
+    if report["min"] is not None:
+        print(f"Min Salary: {report['min'].display()}")
+        print(f"Max Salary: {report['max'].display()}")
+    else:
+        print("The files do not contain valid data!!")
 
-    for i in employees_list:
-        if min_sal == i.gross:
-            print(f"Min Salary: {i.display()}")
-        if max_sal == i.gross:
-            print(f"Max Salary: {i.display()}")
+    errors = report["errors"]
+    print(f"Empty Cells: {errors[0]}, Non Positive Salaries: {errors[1]}, Invalid Datatypes: {errors[2]}")
 
 
 def main():
@@ -1,3 +1,10 @@
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
 def integer_mul(a, b):
     """
     Multiply two integers using a manual approach by creating
@@ -33,6 +40,137 @@ def integer_mul(a, b):
         return "Invalid Datatype"
 
 
+# Limbs are base 10^9 digits stored least significant first in array('Q'),
+# so a limb product plus carries still fits in an unsigned 64-bit word.
+LIMB_BASE = 10 ** 9
+
+
+def to_limbs(n):
+    """
+    Split a non-negative integer into base 10^9 limbs.
+
+    Args:
+        n (int): Non-negative integer.
+
+    Returns:
+        array: Limbs of n, least significant first.
+    """
+    limbs = array("Q")
+    while True:
+        n, limb = divmod(n, LIMB_BASE)
+        limbs.append(limb)
+        if n == 0:
+            return limbs
+
+
+def from_limbs(limbs):
+    """
+    Rebuild an integer from base 10^9 limbs.
+
+    Args:
+        limbs (array): Limbs, least significant first.
+
+    Returns:
+        int: The integer the limbs represent.
+    """
+    n = 0
+    for limb in reversed(limbs):
+        n = n * LIMB_BASE + limb
+    return n
+
+
+def limb_mul(x, y):
+    """
+    Multiply two limb arrays with the schoolbook method and carry propagation.
+
+    Args:
+        x (array): Limbs of the first operand.
+        y (array): Limbs of the second operand.
+
+    Returns:
+        array: Limbs of the product, without leading zero limbs.
+    """
+    result = array("Q", bytes(8 * (len(x) + len(y))))
+
+    for i, xi in enumerate(x):
+        if xi == 0:
+            continue
+        carry = 0
+        k = i
+        for yj in y:
+            carry, result[k] = divmod(result[k] + xi * yj + carry, LIMB_BASE)
+            k += 1
+        while carry:
+            carry, result[k] = divmod(result[k] + carry, LIMB_BASE)
+            k += 1
+
+    while len(result) > 1 and result[-1] == 0:
+        result.pop()
+    return result
+
+
+def limb_integer_mul(a, b):
+    """
+    Multiply two integers with the limb-based schoolbook method.
+
+    Args:
+        a (int): First integer.
+        b (int): Second integer.
+
+    Returns:
+        int: The result of multiplying a and b.
+        str: "Invalid Datatype" if inputs are not integers.
+    """
+    if isinstance(a, int) and isinstance(b, int):
+        sign = -1 if (a < 0) != (b < 0) else 1
+        return sign * from_limbs(limb_mul(to_limbs(abs(a)), to_limbs(abs(b))))
+    else:
+        return "Invalid Datatype"
+
+
+def batch_limb_mul(big, smalls):
+    """
+    Multiply one large integer by many small ones, splitting the large operand into limbs only once.
+
+    Args:
+        big (int): The large integer shared by every product.
+        smalls (iterable): Integers to multiply big by.
+
+    Returns:
+        list: The products, in the order of smalls, or "Invalid Datatype" for non-integer entries.
+    """
+    if not isinstance(big, int):
+        return ["Invalid Datatype" for _ in smalls]
+
+    big_limbs = to_limbs(abs(big))
+    products = []
+
+    for small in smalls:
+        if not isinstance(small, int):
+            products.append("Invalid Datatype")
+            continue
+
+        sign = -1 if (big < 0) != (small < 0) else 1
+        small = abs(small)
+
+        if small < LIMB_BASE:
+            # Single-limb operand: one pass over big's limbs
+            result = array("Q")
+            carry = 0
+            for limb in big_limbs:
+                carry, digit = divmod(limb * small + carry, LIMB_BASE)
+                result.append(digit)
+            while carry:
+                carry, digit = divmod(carry, LIMB_BASE)
+                result.append(digit)
+        else:
+            result = limb_mul(big_limbs, to_limbs(small))
+
+        products.append(sign * from_limbs(result))
+
+    return products
+
+
 def d_c_integer_mul(a, b):
     """
     Multiply two integers using a divide-and-conquer approach.
@@ -65,34 +203,223 @@ def d_c_integer_mul(a, b):
         return "Invalid Datatype"
 
 
-def check_compatible(arr):
+# Operand sizes (in bits) tuned with benchmark_multiplication(). The native multiply is already
+# Karatsuba in C, so multiply() only leaves it for Toom-3 on very large operands.
+KARATSUBA_CUTOFF = 2048
+TOOM3_BASE_CUTOFF = 20000
+TOOM3_CUTOFF = 300000
+
+
+def karatsuba_mul(a, b, cutoff=KARATSUBA_CUTOFF):
     """
-    Check if the array is compatible with the global 'base' array.
+    Multiply two non-negative integers with Karatsuba, splitting by bit length.
 
-    Compatibility means both arrays contain the same elements.
+    Halves are taken with shifts and masks instead of powers of 10, and
+    operands below the cutoff (in bits) use the native multiply.
 
     Args:
-        arr (list): Input array to check against the base array.
+        a (int): First non-negative integer.
+        b (int): Second non-negative integer.
+        cutoff (int): Bit length below which the native multiply is used.
 
     Returns:
-        bool: True if arrays are compatible, False otherwise.
+        int: The result of multiplying a and b.
+    """
+    n = max(a.bit_length(), b.bit_length())
+    if n <= cutoff or min(a.bit_length(), b.bit_length()) <= cutoff:
+        return a * b
+
+    n //= 2
+    mask = (1 << n) - 1
+
+    x1, x0 = a >> n, a & mask
+    y1, y0 = b >> n, b & mask
+
+    p = karatsuba_mul(x1, y1, cutoff)
+    q = karatsuba_mul(x0, y0, cutoff)
+    r = karatsuba_mul(x1 + x0, y1 + y0, cutoff) - p - q
+
+    return (p << (2 * n)) + (r << n) + q
+
+
+def toom3_mul(a, b, cutoff=TOOM3_BASE_CUTOFF):
+    """
+    Multiply two integers with Toom-Cook 3-way splitting.
+
+    Each operand is split into three bit-length parts, the product polynomial is
+    evaluated at 0, 1, -1, -2 and infinity, and the coefficients are recovered
+    with Bodrato's interpolation sequence. Parts below the cutoff (in bits) use
+    the native multiply.
+
+    Args:
+        a (int): First integer.
+        b (int): Second integer.
+        cutoff (int): Bit length below which the native multiply is used.
+
+    Returns:
+        int: The result of multiplying a and b.
+    """
+    sign = -1 if (a < 0) != (b < 0) else 1
+    a, b = abs(a), abs(b)
+
+    n = max(a.bit_length(), b.bit_length())
+    if n <= cutoff or min(a.bit_length(), b.bit_length()) <= cutoff:
+        return sign * (a * b)
+
+    k = (n + 2) // 3
+    mask = (1 << k) - 1
+
+    a0, a1, a2 = a & mask, (a >> k) & mask, a >> (2 * k)
+    b0, b1, b2 = b & mask, (b >> k) & mask, b >> (2 * k)
+
+    # Evaluation
+    p = a0 + a2
+    q = b0 + b2
+    r0 = toom3_mul(a0, b0, cutoff)
+    r1 = toom3_mul(p + a1, q + b1, cutoff)
+    rm1 = toom3_mul(p - a1, q - b1, cutoff)
+    rm2 = toom3_mul(((p - a1 + a2) << 1) - a0, ((q - b1 + b2) << 1) - b0, cutoff)
+    r4 = toom3_mul(a2, b2, cutoff)
+
+    # Interpolation (all divisions are exact)
+    r3 = (rm2 - r1) // 3
+    r1 = (r1 - rm1) >> 1
+    r2 = rm1 - r0
+    r3 = ((r2 - r3) >> 1) + (r4 << 1)
+    r2 = r2 + r1 - r4
+    r1 = r1 - r3
+
+    return sign * (r0 + (r1 << k) + (r2 << (2 * k)) + (r3 << (3 * k)) + (r4 << (4 * k)))
+
+
+def multiply(a, b):
+    """
+    Multiply two integers, picking the algorithm by operand size.
+
+    Operands up to TOOM3_CUTOFF bits use the native multiply and larger
+    ones use Toom-3.
+
+    Args:
+        a (int): First integer.
+        b (int): Second integer.
+
+    Returns:
+        int: The result of multiplying a and b.
+        str: "Invalid Datatype" if inputs are not integers.
+    """
+    if isinstance(a, int) and isinstance(b, int):
+        if min(a.bit_length(), b.bit_length()) <= TOOM3_CUTOFF:
+            return a * b
+        return toom3_mul(a, b)
+    else:
+        return "Invalid Datatype"
+
+
+def benchmark_multiplication(digit_sizes=(10, 100, 1000, 10000, 100000, 1000000), repeat=3):
+    """
+    Time d_c_integer_mul, karatsuba_mul, toom3_mul, multiply and the builtin *
+    on random operands of each digit size, printing the best time in seconds.
+
+    d_c_integer_mul is skipped where str() on its operands would exceed the
+    interpreter's integer string conversion limit.
+
+    Args:
+        digit_sizes (tuple): Operand sizes in decimal digits.
+        repeat (int): Number of timed runs per algorithm.
+    """
+    import random
+    import sys
+    import timeit
+
+    str_limit = sys.get_int_max_str_digits() if hasattr(sys, "get_int_max_str_digits") else 0
+    algorithms = [("d_c_integer_mul", d_c_integer_mul), ("karatsuba_mul", karatsuba_mul),
+                  ("toom3_mul", toom3_mul), ("multiply", multiply), ("builtin *", lambda x, y: x * y)]
+
+    print(f"{'Digits':<10}" + "".join(f"{name:<18}" for name, _ in algorithms))
+    for digits in digit_sizes:
+        a = random.randrange(10 ** (digits - 1), 10 ** digits)
+        b = random.randrange(10 ** (digits - 1), 10 ** digits)
+        expected = a * b
+        row = f"{digits:<10}"
+
+        for name, func in algorithms:
+            if func is d_c_integer_mul and (digits > 10000 or (str_limit and digits * 2 > str_limit)):
+                row += f"{'n/a':<18}"
+                continue
+            assert func(a, b) == expected
+            best = min(timeit.repeat(lambda: func(a, b), number=1, repeat=repeat))
+            row += f"{best:<18.6f}"
+
+        print(row)
+
+
+class ReferenceSet:
+    """
+    Fingerprint of a reference multiset, computed once so repeated compatibility
+    checks only have to scan the candidate array.
+
+    If the reference holds each integer of a range lo..hi exactly once, candidates
+    are checked with a sort-free permutation test; otherwise element counts are compared.
+    """
+
+    def __init__(self, base):
+        self.size = len(base)
+        self.counts = Counter(base)
+        self.low = self.high = None
+
+        if self.size and all(type(i) is int for i in self.counts):
+            low, high = min(self.counts), max(self.counts)
+            if high - low + 1 == self.size == len(self.counts):
+                self.low, self.high = low, high
+
+    def matches(self, arr):
+        """
+        Check if an array contains exactly the reference's elements.
+
+        Args:
+            arr (list): Input array to check.
+
+        Returns:
+            bool: True if the array is compatible, False otherwise.
+        """
+        if len(arr) != self.size:
+            return False
+
+        if self.low is None:
+            return Counter(arr) == self.counts
+
+        seen = bytearray(self.size)
+        for i in arr:
+            if type(i) is not int:
+                return Counter(arr) == self.counts  # e.g. 2.0 still equals 2
+            if not self.low <= i <= self.high or seen[i - self.low]:
+                return False
+            seen[i - self.low] = 1
+        return True
+
+
+def check_compatible(arr, reference):
     """
-    global base
-    temp = arr.copy()
-    temp2 = base.copy()
+    Check if the array is compatible with a reference array in O(n).
 
-    for i in base:
-        if i in temp:
-            temp.remove(i)
-            temp2.remove(i)
+    Compatibility means both arrays contain the same elements.
 
-    if temp or temp2:
-        return False
+    Args:
+        arr (list): Input array to check against the reference.
+        reference (list or ReferenceSet): The reference array, or its cached
+            ReferenceSet. Pass a ReferenceSet when checking many arrays against
+            the same reference so its fingerprint is built only once.
 
-    return True
+    Returns:
+        bool: True if arrays are compatible, False otherwise.
+    """
+    if not isinstance(reference, ReferenceSet):
+        reference = ReferenceSet(reference)
 
+    return reference.matches(arr)
 
-def count_inversions(arr):
+
+def count_inversions(arr, reference):
     """
     Count the number of inversions in an array using a merge sort approach.
 
@@ -100,6 +427,8 @@ def count_inversions(arr):
 
     Args:
         arr (list): The array for which to count inversions.
+        reference (list or ReferenceSet): The reference array the input must be
+            compatible with.
 
     Returns:
         int: The number of inversions in the array.
@@ -156,19 +485,124 @@ def count_inversions(arr):
 
         return inversions
 
-    if check_compatible(arr):
+    if check_compatible(arr, reference):
         return merge_and_count(arr, arr.copy(), 0, len(arr) - 1)
     else:
         return "The array is not compatible!"
 
 
+def fenwick_inversions(block):
+    """
+    Count the inversions of every row of a 2-D array with a Fenwick tree per row.
+
+    The rows are processed together: each step of the Fenwick update and
+    query is a single NumPy operation over all rows.
+
+    Args:
+        block (numpy.ndarray): 2-D array, one sequence per row.
+
+    Returns:
+        numpy.ndarray: The number of inversions of each row.
+    """
+    rows, n = block.shape
+    counts = np.zeros(rows, dtype=np.int64)
+    if rows == 0 or n < 2:
+        return counts
+
+    # Stable double argsort turns each row into ranks 1..n; equal values keep
+    # their order, so ties are not counted as inversions.
+    ranks = np.argsort(np.argsort(block, axis=1, kind="stable"), axis=1, kind="stable") + 1
+
+    tree = np.zeros((rows, n + 1), dtype=np.int64)
+    row_ids = np.arange(rows)
+
+    for j in range(n):
+        value = ranks[:, j]
+
+        # Elements seen so far that are <= value
+        seen = np.zeros(rows, dtype=np.int64)
+        idx = value.copy()
+        while True:
+            active = idx > 0
+            if not active.any():
+                break
+            seen[active] += tree[row_ids[active], idx[active]]
+            idx = idx - (idx & -idx)
+
+        counts += j - seen
+
+        idx = value.copy()
+        while True:
+            active = idx <= n
+            if not active.any():
+                break
+            tree[row_ids[active], idx[active]] += 1
+            idx = idx + (idx & -idx)
+
+    return counts
+
+
+def count_inversions_batch(arrays, workers=None, block_elements=1 << 22):
+    """
+    Count the inversions of many sequences at once.
+
+    Rows are split into blocks that are counted in parallel across a process
+    pool (or in this process when workers is 1). Each block holds about
+    block_elements values, so the per-row Fenwick trees and rank arrays a
+    worker allocates stay bounded however long the sequences are.
+
+    Args:
+        arrays (array-like): 2-D array with one sequence (e.g. a permutation) per row.
+        workers (int): Number of worker processes, None for one per CPU.
+        block_elements (int): Approximate number of values counted per task.
+
+    Returns:
+        numpy.ndarray: The number of inversions of each row.
+    """
+    arrays = np.asarray(arrays)
+    if arrays.ndim != 2:
+        raise ValueError("Expected a 2-D array with one sequence per row.")
+
+    block_rows = max(1, block_elements // max(arrays.shape[1], 1))
+    blocks = [arrays[i:i + block_rows] for i in range(0, len(arrays), block_rows)]
+    if len(blocks) <= 1 or workers == 1:
+        results = [fenwick_inversions(block) for block in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(fenwick_inversions, blocks))
+
+    return np.concatenate(results) if results else np.zeros(0, dtype=np.int64)
+
+
+def kendall_tau_distance(ranking1, ranking2):
+    """
+    Count the pairs of items that two rankings order differently.
+
+    Args:
+        ranking1 (list): Items in the order of the first ranking.
+        ranking2 (list): The same items in the order of the second ranking.
+
+    Returns:
+        int: The Kendall tau distance between the rankings.
+        str: "The rankings are not compatible!" if they do not hold the same items.
+    """
+    position = {item: i for i, item in enumerate(ranking1)}
+    if len(position) != len(ranking1) or len(ranking2) != len(ranking1) or any(
+            item not in position for item in ranking2):
+        return "The rankings are not compatible!"
+
+    relabelled = np.array([[position[item] for item in ranking2]], dtype=np.int64)
+    return int(fenwick_inversions(relabelled)[0])
+
+
 # Test Cases
 base = [1, 2, 3, 4, 5]
+base_reference = ReferenceSet(base)
 course_list = [[5, 4, 3, 2, 1], [4, 3, 2, 1, 5], [1, 2, 3, 5, 4], [1, 2, 3, 4, 5], [5, 3, 4, 1, 2], [1, 2, 3, 4],
                [6, 2, 1, 4], [1, 2, 3, 4, 5, 6], [7, 8, 9, 10], []]
 
 for i in course_list:
-    print("Number of inversions:", count_inversions(i))
+    print("Number of inversions:", count_inversions(i, base_reference))
 
 print(integer_mul(4554210, 7891105))
 print(integer_mul(724578, 975432))
@@ -181,6 +615,17 @@ print(integer_mul(7974.17, 93210.22))
 print(integer_mul(12345.17, 54321.61))
 print(integer_mul(786132.14, 215473.66))
 
+print(limb_integer_mul(4554210, 7891105))
+print(limb_integer_mul(724578, 975432))
+print(limb_integer_mul(9821204, 7045222))
+print(limb_integer_mul(966425, 993044))
+print(limb_integer_mul(70854699, 24753112))
+print(limb_integer_mul(5678.00, 60799.17))
+print(limb_integer_mul(333.333, 666.666))
+print(limb_integer_mul(7974.17, 93210.22))
+print(limb_integer_mul(12345.17, 54321.61))
+print(limb_integer_mul(786132.14, 215473.66))
+
 print(d_c_integer_mul(4554210, 7891105))
 print(d_c_integer_mul(724578, 975432))
 print(d_c_integer_mul(9821204, 7045222))
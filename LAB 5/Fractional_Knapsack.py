@@ -1,4 +1,8 @@
+import heapq
 import random
+import time
+
+import numpy as np
 
 class Item:
     def __init__(self, name, value, weight, shelf_life):
@@ -44,6 +48,104 @@ def fractional_knapsack(items, capacity):
 
     return total_value, total_weight_used, selected_items
 
+def fractional_knapsack_lazy(items, capacity):
+    if capacity <= 0:
+        return "Error: Vehicle capacity must be greater than 0."
+    if any(item.shelf_life <= 0 for item in items):
+        return "Error: Shelf life of items must be greater than 0."
+    if sum(item.weight for item in items) <= capacity:
+        return "Error: Total weight of items is less than or equal to zero."
+
+    # Heapify is O(n); only the items that end up in the vehicle are popped
+    heap = [(-(item.value / item.weight) / item.shelf_life, i) for i, item in enumerate(items)]
+    heapq.heapify(heap)
+    total_value = 0.0
+    total_weight_used = 0.0
+    remaining_capacity = capacity
+    selected_items = []
+
+    while heap and remaining_capacity > 0:
+        item = items[heapq.heappop(heap)[1]]
+        if item.weight <= remaining_capacity:
+            selected_items.append((item, 1))
+            total_value += item.value
+            total_weight_used += item.weight
+            remaining_capacity -= item.weight
+        else:
+            fraction = remaining_capacity / item.weight
+            selected_items.append((item, fraction))
+            total_value += item.value * fraction
+            total_weight_used += item.weight * fraction
+            remaining_capacity = 0
+
+    if total_value == 0:
+        return "Error: No value could be obtained from the items."
+
+    return total_value, total_weight_used, selected_items
+
+
+def benchmark_knapsack(n=10 ** 6, capacity=200):
+    items = [Item(f"Item_{i + 1}", random.randint(0, 1000), random.randint(10, 200), random.randint(10, 200))
+             for i in range(n)]
+
+    start = time.perf_counter()
+    lazy_result = fractional_knapsack_lazy(items, capacity)
+    lazy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sort_result = fractional_knapsack(list(items), capacity)
+    sort_time = time.perf_counter() - start
+
+    assert lazy_result[2] == sort_result[2]
+    print(f"Full sort: {sort_time:.3f} s")
+    print(f"Lazy heap: {lazy_time:.3f} s")
+
+
+# Solves every capacity against the same items at once. Unlike fractional_knapsack, a vehicle
+# whose capacity covers the total item weight is not an error: it simply loads every item whole
+# (full_counts equals the item count and its partial fraction is 0).
+def fractional_knapsack_batch(values, weights, shelf_lives, capacities):
+    values = np.asarray(values, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    shelf_lives = np.asarray(shelf_lives, dtype=np.float64)
+    capacities = np.atleast_1d(np.asarray(capacities, dtype=np.float64))  # A single capacity is one vehicle
+
+    if np.any(capacities <= 0):
+        return "Error: Vehicle capacity must be greater than 0."
+    if np.any(shelf_lives <= 0):
+        return "Error: Shelf life of items must be greater than 0."
+    if len(values) == 0:
+        return "Error: No items to load."
+
+    # Every vehicle fills from the same density order: whole items up to the cumulative
+    # weight that fits, then a fraction of the next one.
+    order = np.argsort(-(values / weights) / shelf_lives, kind="stable")
+    cumulative_weight = np.cumsum(weights[order])
+    cumulative_value = np.cumsum(values[order])
+
+    full_counts = np.searchsorted(cumulative_weight, capacities, side="right")
+    used_weight = np.where(full_counts > 0, cumulative_weight[np.maximum(full_counts - 1, 0)], 0.0)
+    used_value = np.where(full_counts > 0, cumulative_value[np.maximum(full_counts - 1, 0)], 0.0)
+
+    has_partial = full_counts < len(order)
+    partial_items = order[np.minimum(full_counts, len(order) - 1)]
+    partial_fractions = np.zeros(len(capacities))
+    partial_fractions[has_partial] = (capacities[has_partial] - used_weight[has_partial]) / weights[partial_items[has_partial]]
+
+    total_values = used_value + np.where(has_partial, partial_fractions * values[partial_items], 0.0)
+    total_weights = used_weight + np.where(has_partial, partial_fractions * weights[partial_items], 0.0)
+
+    return total_values, total_weights, order, full_counts, partial_fractions
+
+
+def batch_selection(order, full_counts, partial_fractions, vehicle):
+    fractions = np.zeros(len(order))
+    fractions[order[:full_counts[vehicle]]] = 1.0
+    if full_counts[vehicle] < len(order):
+        fractions[order[full_counts[vehicle]]] = partial_fractions[vehicle]
+    return fractions
+
+
 items = [
     Item(f"Item_{i + 1}", random.randint(0, 1000), random.randint(10, 200), random.randint(10, 200))
     for i in range(100)
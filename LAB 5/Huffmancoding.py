@@ -1,6 +1,17 @@
+import hashlib
 import heapq
-from collections import defaultdict
+from collections import Counter, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import csv
+import json
+import mmap
 import os
+import struct
+import time
+import zlib
+from io import BytesIO
+
+import numpy as np
 
 import PyPDF2
 from docx import Document
@@ -8,6 +19,8 @@ from bs4 import BeautifulSoup
 
 
 class Node:
+    __slots__ = ("ch", "freq", "left", "right")
+
     def __init__(self, character, frequency):
         self.ch = character
         self.freq = frequency
@@ -19,10 +32,39 @@ class Node:
 
 
 def calculate_frequency(s):
-    freq_map = defaultdict(int)
-    for ch in s:
-        freq_map[ch] += 1
-    return freq_map
+    if isinstance(s, (bytes, bytearray, memoryview, mmap.mmap)):
+        return histogram_to_map(byte_histogram(s))
+    return Counter(s)
+
+
+def byte_histogram(data):
+    return np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+
+
+def histogram_to_map(histogram):
+    return {int(byte): int(histogram[byte]) for byte in np.flatnonzero(histogram)}
+
+
+def count_file_range(file_path, start, stop, block_size=1 << 20):
+    with open(file_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        histogram = np.zeros(256, dtype=np.int64)
+        for offset in range(start, stop, block_size):
+            histogram += byte_histogram(data[offset:min(offset + block_size, stop)])
+        return histogram
+
+
+def count_file_frequency(file_path, workers=None, split_size=1 << 24):
+    size = os.path.getsize(file_path)
+    ranges = [(start, min(start + split_size, size)) for start in range(0, size, split_size)]
+
+    if len(ranges) <= 1 or workers == 1:
+        histograms = [count_file_range(file_path, start, stop) for start, stop in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            histograms = list(pool.map(count_file_range, [file_path] * len(ranges),
+                                       [start for start, _ in ranges], [stop for _, stop in ranges]))
+
+    return histogram_to_map(sum(histograms, np.zeros(256, dtype=np.int64)))
 
 
 def build_huffman_tree(freq_map):
@@ -40,6 +82,66 @@ def build_huffman_tree(freq_map):
     return pq[0]
 
 
+# Tree stored in flat arrays: nodes 0..n-1 are the leaves (symbols[i]), internal
+# nodes follow in merge order and the root is the last node. -1 marks "none".
+FlatTree = namedtuple("FlatTree", ["symbols", "freq", "left", "right", "parent"])
+
+
+def build_flat_tree(freq_map):
+    symbols = list(freq_map)
+    n = len(symbols)
+    counts = np.fromiter((freq_map[symbol] for symbol in symbols), dtype=np.int64, count=n)
+    order = np.argsort(counts, kind="stable")
+    symbols = [symbols[i] for i in order]
+
+    size = max(2 * n - 1, 0)
+    freq = np.zeros(size, dtype=np.int64)
+    freq[:n] = counts[order]
+    left = np.full(size, -1, dtype=np.int64)
+    right = np.full(size, -1, dtype=np.int64)
+    parent = np.full(size, -1, dtype=np.int64)
+
+    # Two queues: sorted leaves and internal nodes, which are created in non-decreasing frequency order
+    weights = freq.tolist()
+    left_list, right_list = [-1] * size, [-1] * size
+    leaf, internal = 0, n
+    for node in range(n, size):
+        children = []
+        for _ in range(2):
+            if leaf < n and (internal >= node or weights[leaf] <= weights[internal]):
+                children.append(leaf)
+                leaf += 1
+            else:
+                children.append(internal)
+                internal += 1
+        left_list[node], right_list[node] = children
+        weights[node] = weights[children[0]] + weights[children[1]]
+
+    if size > n:
+        freq[:] = weights
+        left[:] = left_list
+        right[:] = right_list
+        internal_nodes = np.arange(n, size)
+        parent[left[n:]] = internal_nodes
+        parent[right[n:]] = internal_nodes
+
+    return FlatTree(symbols, freq, left, right, parent)
+
+
+def flat_code_lengths(tree):
+    n = len(tree.symbols)
+    if n == 1:
+        return {tree.symbols[0]: 1}
+
+    # Parents are always created after their children, so one reverse sweep gives every depth
+    depth = [0] * len(tree.freq)
+    parent = tree.parent.tolist()
+    for node in range(len(depth) - 2, -1, -1):
+        depth[node] = depth[parent[node]] + 1
+
+    return dict(zip(tree.symbols, depth[:n]))
+
+
 def assign_codes(root, code, huffman_codes):
     if root is None:
         return
@@ -61,52 +163,788 @@ def calculate_compression_ratio(original, compressed):
     return original_size / compressed_size
 
 
-def read_pdf(file_path):
-    try:
-        with open(file_path, "rb") as file:
-            reader = PyPDF2.PdfReader(file)
-            text = "".join(page.extract_text() or "" for page in reader.pages)
-            return text
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}")
-        return None
+# Container layout: magic, original size (uint64), symbol count (uint16),
+# (symbol, code length) byte pairs in canonical order, then the packed payload.
+MAGIC = b"HUF1"
+HEADER = struct.Struct(">4sQH")
+CHUNK_SIZE = 1 << 16
+MAX_CODE_LENGTH = 15  # Same limit as DEFLATE
+
+
+def code_lengths(freq_map, max_length=MAX_CODE_LENGTH):
+    if not freq_map:
+        return {}
+    lengths = flat_code_lengths(build_flat_tree(freq_map))
+
+    if max_length and max(lengths.values()) > max_length:
+        lengths = limit_code_lengths(lengths, freq_map, max_length)
+    return lengths
+
+
+def limit_code_lengths(lengths, freq_map, max_length):
+    if len(lengths) > 1 << max_length:
+        raise ValueError(f"Too many symbols for {max_length}-bit codes")
+
+    # Clamp long codes, then lengthen the rarest codes below the limit until the Kraft sum fits again
+    lengths = {symbol: min(length, max_length) for symbol, length in lengths.items()}
+    kraft = sum(1 << (max_length - length) for length in lengths.values())
+    by_rarity = sorted(lengths, key=lambda symbol: (freq_map[symbol], -lengths[symbol]))
+
+    while kraft > 1 << max_length:
+        for symbol in by_rarity:
+            if lengths[symbol] < max_length:
+                kraft -= 1 << (max_length - lengths[symbol] - 1)
+                lengths[symbol] += 1
+                break
+
+    # Give back any slack to the most frequent symbols
+    for symbol in reversed(by_rarity):
+        while lengths[symbol] > 1 and kraft + (1 << (max_length - lengths[symbol])) <= 1 << max_length:
+            kraft += 1 << (max_length - lengths[symbol])
+            lengths[symbol] -= 1
+
+    return lengths
+
+
+def canonical_order(lengths):
+    return sorted(lengths, key=lambda symbol: (lengths[symbol], symbol))
+
+
+def canonical_codes(lengths):
+    codes = {}
+    code = 0
+    prev_length = 0
+    for symbol in canonical_order(lengths):
+        code <<= lengths[symbol] - prev_length
+        codes[symbol] = (code, lengths[symbol])
+        prev_length = lengths[symbol]
+        code += 1
+    return codes
+
+
+def write_header(file, original_size, lengths):
+    file.write(HEADER.pack(MAGIC, original_size, len(lengths)))
+    file.write(bytes(value for symbol in canonical_order(lengths) for value in (symbol, lengths[symbol])))
+
+
+def read_header(file):
+    magic, original_size, count = HEADER.unpack(file.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("Not a Huffman compressed file")
+    table = file.read(2 * count)
+    lengths = {table[i]: table[i + 1] for i in range(0, len(table), 2)}
+    return original_size, lengths
+
+
+def code_bit_strings(lengths):
+    return {symbol: format(code, f"0{length}b") for symbol, (code, length) in canonical_codes(lengths).items()}
+
+
+# Writes the whole bytes of a string of bits and returns the bits left over
+def pack_bits(bits, output):
+    whole = len(bits) - len(bits) % 8
+    if whole:
+        output.write(int(bits[:whole], 2).to_bytes(whole // 8, "big"))
+    return bits[whole:]
+
+
+# bit_strings maps each byte to its code as a string of "0"/"1"; any table indexable by byte works
+def encode_chunks(chunks, bit_strings, output):
+    pending = ""
+    for chunk in chunks:
+        pending = pack_bits(pending + "".join(bit_strings[byte] for byte in chunk), output)
+    if pending:
+        pack_bits(pending.ljust(8, "0"), output)
+
+
+def read_chunks(file, chunk_size=CHUNK_SIZE):
+    while chunk := file.read(chunk_size):
+        yield chunk
 
 
-def read_docx(file_path):
+def compress_file(input_path, output_path, chunk_size=CHUNK_SIZE):
+    freq_map = count_file_frequency(input_path)
+    lengths = code_lengths(freq_map)
+    original_size = sum(freq_map.values())
+
+    with open(input_path, "rb") as source, open(output_path, "wb") as output:
+        write_header(output, original_size, lengths)
+        encode_chunks(read_chunks(source, chunk_size), code_bit_strings(lengths), output)
+
+    return original_size, os.path.getsize(output_path)
+
+
+def lookup_table(lengths):
+    table_bits = max(lengths.values())
+    first = [None] * (1 << table_bits)
+    for symbol, (code, length) in canonical_codes(lengths).items():
+        span = 1 << (table_bits - length)
+        first[code * span:(code + 1) * span] = [(symbol, length)] * span
+    return table_bits, first
+
+
+def decoding_table(lengths):
+    table_bits, first = lookup_table(lengths)
+
+    # Each entry holds every symbol that decodes completely inside its table_bits window
+    table = []
+    for index in range(1 << table_bits):
+        if first[index] is None:  # Only a lone one-symbol code leaves gaps
+            table.append(first[0] + (b"", first[0][1]))
+            continue
+        symbols = bytearray()
+        used = 0
+        while first[(index << used) & ((1 << table_bits) - 1)] is not None:
+            symbol, length = first[(index << used) & ((1 << table_bits) - 1)]
+            if used + length > table_bits:
+                break
+            symbols.append(symbol)
+            used += length
+        table.append(first[index] + (bytes(symbols), used))
+
+    return table_bits, table
+
+
+# Returns a function that decodes one symbol from the top of a bit accumulator with a lookup
+# table, giving back the symbol and the number of bits still unread
+def table_step(table, table_bits):
+    mask = (1 << table_bits) - 1
+
+    def step(acc, nbits):
+        symbol, length = table[(acc >> (nbits - table_bits)) & mask][:2]
+        return symbol, nbits - length
+
+    return step
+
+
+# Decodes the last count symbols once fewer than window real bits are left, padding the
+# accumulator with zeros so the table can still be probed
+def decode_tail(acc, nbits, count, window, step):
+    acc <<= window
+    nbits += window
+    decoded = bytearray()
+    for _ in range(count):
+        if nbits <= window:
+            raise ValueError("Compressed payload is truncated")
+        symbol, nbits = step(acc, nbits)
+        decoded.append(symbol)
+    return decoded
+
+
+def decode_chunks(chunks, lengths, original_size, output, chunk_size=CHUNK_SIZE):
+    if not original_size:
+        return
+
+    table_bits, table = decoding_table(lengths)
+    mask = (1 << table_bits) - 1
+    decoded = bytearray()
+    remaining = original_size
+    acc = nbits = 0
+
+    for chunk in chunks:
+        for byte in chunk:
+            acc = (acc << 8) | byte
+            nbits += 8
+            while nbits >= table_bits and remaining:
+                symbol, length, symbols, bits = table[(acc >> (nbits - table_bits)) & mask]
+                if len(symbols) <= remaining:
+                    decoded += symbols
+                    nbits -= bits
+                    remaining -= len(symbols)
+                else:
+                    decoded.append(symbol)
+                    nbits -= length
+                    remaining -= 1
+            acc &= (1 << nbits) - 1
+        if len(decoded) >= chunk_size:
+            output.write(decoded)
+            decoded.clear()
+        if not remaining:
+            break
+
+    decoded += decode_tail(acc, nbits, remaining, table_bits, table_step(table, table_bits))
+    output.write(decoded)
+
+
+def tree_from_lengths(lengths):
+    root = Node(None, 0)
+    for symbol, (code, length) in canonical_codes(lengths).items():
+        node = root
+        for shift in range(length - 1, -1, -1):
+            side = "right" if (code >> shift) & 1 else "left"
+            if getattr(node, side) is None:
+                setattr(node, side, Node(None, 0))
+            node = getattr(node, side)
+        node.ch = symbol
+    return root
+
+
+def tree_walk_decode(payload, root, original_size):
+    decoded = bytearray()
+    node = root
+    for byte in payload:
+        for shift in range(7, -1, -1):
+            node = node.right if (byte >> shift) & 1 else node.left
+            if node.ch is not None:
+                decoded.append(node.ch)
+                node = root
+                if len(decoded) == original_size:
+                    return bytes(decoded)
+    return bytes(decoded)
+
+
+def benchmark_decoding(file_path):
+    with open(file_path, "rb") as file:
+        data = file.read()
+
+    lengths = code_lengths(calculate_frequency(data))
+    encoded = BytesIO()
+    encode_chunks([data], code_bit_strings(lengths), encoded)
+    payload = encoded.getvalue()
+    megabytes = len(data) / 1e6
+
+    start = time.perf_counter()
+    decoded = BytesIO()
+    decode_chunks([payload], lengths, len(data), decoded)
+    table_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    walked = tree_walk_decode(payload, tree_from_lengths(lengths), len(data))
+    walk_time = time.perf_counter() - start
+
+    assert decoded.getvalue() == walked == data
+    print(f"Table decoder: {megabytes / table_time:.2f} MB/s")
+    print(f"Tree-walk decoder: {megabytes / walk_time:.2f} MB/s")
+
+
+def decompress_file(input_path, output_path, chunk_size=CHUNK_SIZE):
+    with open(input_path, "rb") as source, open(output_path, "wb") as output:
+        original_size, lengths = read_header(source)
+        decode_chunks(read_chunks(source, chunk_size), lengths, original_size, output, chunk_size)
+
+    return original_size
+
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "huffman_extract")
+
+
+def iter_pdf(file_path):
+    with open(file_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        for page in reader.pages:
+            yield page.extract_text() or ""
+
+
+def iter_docx(file_path):
+    for i, paragraph in enumerate(Document(file_path).paragraphs):
+        yield ("\n" if i else "") + paragraph.text
+
+
+def iter_html(file_path):
+    with open(file_path, "r", encoding="utf-8") as file:
+        soup = BeautifulSoup(file, "html.parser")
+    for i, text in enumerate(soup.strings):
+        yield ("\n" if i else "") + text
+
+
+EXTRACTORS = {".pdf": iter_pdf, ".docx": iter_docx, ".html": iter_html}
+
+
+def cache_path(file_path, cache_dir=CACHE_DIR):
+    stat = os.stat(file_path)
+    key = f"{os.path.abspath(file_path)}|{stat.st_mtime_ns}|{stat.st_size}"
+    return os.path.join(cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".txt")
+
+
+def iter_text(file_path, cache_dir=CACHE_DIR, chunk_size=CHUNK_SIZE):
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in EXTRACTORS:
+        raise ValueError(f"Unsupported file format: {file_path}")
+
+    cached = cache_path(file_path, cache_dir)
+    if os.path.exists(cached):
+        with open(cached, "r", encoding="utf-8", newline="") as file:
+            while chunk := file.read(chunk_size):
+                yield chunk
+        return
+
+    # Extract and fill the cache in the same pass; only a complete extraction is kept
+    os.makedirs(cache_dir, exist_ok=True)
+    partial = f"{cached}.{os.getpid()}.tmp"
     try:
-        doc = Document(file_path)
-        return "\n".join(paragraph.text for paragraph in doc.paragraphs)
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}")
-        return None
+        with open(partial, "w", encoding="utf-8", newline="") as cache:
+            for piece in EXTRACTORS[extension](file_path):
+                cache.write(piece)
+                yield piece
+        os.replace(partial, cached)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+def iter_book_bytes(file_path, cache_dir=CACHE_DIR, chunk_size=CHUNK_SIZE):
+    if os.path.splitext(file_path)[1].lower() in EXTRACTORS:
+        for text in iter_text(file_path, cache_dir, chunk_size):
+            yield text.encode("utf-8")
+        return
+
+    # Plain text and binary files are compressed as raw bytes straight from the page cache
+    if os.path.getsize(file_path) == 0:
+        return
+    with open(file_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for offset in range(0, len(data), chunk_size):
+            yield data[offset:offset + chunk_size]
+
+
+def compress_book(file_path, output_path, cache_dir=CACHE_DIR):
+    histogram = np.zeros(256, dtype=np.int64)
+    for chunk in iter_book_bytes(file_path, cache_dir):
+        histogram += byte_histogram(chunk)
+
+    lengths = code_lengths(histogram_to_map(histogram))
+    with open(output_path, "wb") as output:
+        write_header(output, int(histogram.sum()), lengths)
+        encode_chunks(iter_book_bytes(file_path, cache_dir), code_bit_strings(lengths), output)
+
+    return int(histogram.sum()), os.path.getsize(output_path)
+
+
+# Adaptive stream layout: magic, varint block size, then segments of varint symbol count,
+# varint payload bytes and the byte-padded payload; a segment with zero symbols ends the
+# stream. Input is cut into blocks coded with one model built from the counts of all
+# earlier blocks, so no table is ever transmitted. Blocks start at FIRST_BLOCK bytes and
+# double up to block_size, so a cold model is replaced quickly. Whatever a read returns is
+# flushed at once as a segment of the current block, without rebuilding the model.
+ADAPTIVE_MAGIC = b"HUFB"
+COUNT_LIMIT = 1 << 24
+FIRST_BLOCK = 256
+
+
+def adaptive_lengths(counts):
+    return code_lengths(dict(enumerate(counts)))
+
+
+def update_counts(counts, block):
+    counts += byte_histogram(block)
+    if counts.sum() > COUNT_LIMIT:  # Halve old statistics so the model keeps adapting
+        counts[:] = (counts + 1) // 2
+
+
+def read_block(source, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = source.read(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return bytes(data)
+
+
+def write_varint(output, value):
+    data = bytearray()
+    while value >= 0x80:
+        data.append((value & 0x7F) | 0x80)
+        value >>= 7
+    data.append(value)
+    output.write(data)
+
+
+def read_varint(source):
+    value = shift = 0
+    while True:
+        byte = source.read(1)
+        if not byte:
+            raise ValueError("Compressed stream is truncated")
+        value |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+def adaptive_bit_strings(counts):
+    bit_strings = code_bit_strings(adaptive_lengths(counts))
+    return [bit_strings[byte] for byte in range(256)]
+
+
+def adaptive_compress(source, output, block_size=CHUNK_SIZE):
+    counts = np.ones(256, dtype=np.int64)
+    bit_strings = adaptive_bit_strings(counts)
+    block = bytearray()
+    limit = min(FIRST_BLOCK, block_size)
+    total = 0
+
+    output.write(ADAPTIVE_MAGIC)
+    write_varint(output, block_size)
+
+    # read1 returns whatever a pipe or socket has ready instead of waiting for a full block
+    read = getattr(source, "read1", source.read)
+    while data := read(block_size):
+        position = 0
+        while position < len(data):
+            piece = data[position:position + limit - len(block)]
+            bits = "".join(bit_strings[byte] for byte in piece)
+            payload_size = -(-len(bits) // 8)
+            write_varint(output, len(piece))
+            write_varint(output, payload_size)
+            pack_bits(bits.ljust(payload_size * 8, "0"), output)
+
+            block += piece
+            position += len(piece)
+            if len(block) == limit:  # Switch models only on block boundaries
+                update_counts(counts, block)
+                bit_strings = adaptive_bit_strings(counts)
+                block.clear()
+                limit = min(limit * 2, block_size)
+        output.flush()
+        total += len(data)
+
+    write_varint(output, 0)
+    output.flush()
+    return total
+
+
+def decode_segment(payload, table_bits, table, symbols):
+    mask = (1 << table_bits) - 1
+    decoded = bytearray()
+    acc = nbits = 0
+
+    for byte in payload:
+        acc = ((acc << 8) | byte) & ((1 << (table_bits + 8)) - 1)
+        nbits += 8
+        while nbits >= table_bits and len(decoded) < symbols:
+            symbol, length = table[(acc >> (nbits - table_bits)) & mask]
+            decoded.append(symbol)
+            nbits -= length
+
+    decoded += decode_tail(acc, nbits, symbols - len(decoded), table_bits, table_step(table, table_bits))
+    return decoded
+
+
+def adaptive_decompress(source, output):
+    if read_block(source, len(ADAPTIVE_MAGIC)) != ADAPTIVE_MAGIC:
+        raise ValueError("Not an adaptive Huffman stream")
+    block_size = read_varint(source)
+
+    # A plain one-symbol lookup table is cheap enough to rebuild once per block
+    counts = np.ones(256, dtype=np.int64)
+    table_bits, table = lookup_table(adaptive_lengths(counts))
+    block = bytearray()
+    limit = min(FIRST_BLOCK, block_size)
+    total = 0
+
+    while symbols := read_varint(source):
+        payload_size = read_varint(source)
+        payload = read_block(source, payload_size)
+        if len(payload) < payload_size:
+            raise ValueError("Compressed stream is truncated")
+
+        decoded = decode_segment(payload, table_bits, table, symbols)
+        output.write(decoded)
+        output.flush()
+        total += symbols
+
+        block += decoded
+        if len(block) >= limit:
+            update_counts(counts, block)
+            table_bits, table = lookup_table(adaptive_lengths(counts))
+            block.clear()
+            limit = min(limit * 2, block_size)
+
+    return total
+
+
+# A shared model is a code table trained once and reused for many files. Bytes the
+# training sample never had are sent as ESCAPE followed by the raw 8 bits.
+ESCAPE = 256
+MODEL_MAGIC = b"HUFM"
+MODEL_ENTRY = struct.Struct(">HB")
+SHARED_MAGIC = b"HUFS"
+SHARED_HEADER = struct.Struct(">4sIQ")
+
+
+def train_model(file_paths, cache_dir=CACHE_DIR):
+    histogram = np.zeros(256, dtype=np.int64)
+    for file_path in file_paths:
+        for chunk in iter_book_bytes(file_path, cache_dir):
+            histogram += byte_histogram(chunk)
+
+    freq_map = histogram_to_map(histogram)
+    freq_map[ESCAPE] = 1
+    return code_lengths(freq_map)
+
+
+def serialize_model(lengths):
+    entries = b"".join(MODEL_ENTRY.pack(symbol, lengths[symbol]) for symbol in canonical_order(lengths))
+    return MODEL_MAGIC + struct.pack(">H", len(lengths)) + entries
+
+
+def deserialize_model(data):
+    if data[:4] != MODEL_MAGIC:
+        raise ValueError("Not a Huffman model")
+    (count,) = struct.unpack(">H", data[4:6])
+    return dict(MODEL_ENTRY.unpack_from(data, 6 + i * MODEL_ENTRY.size) for i in range(count))
+
 
+def save_model(lengths, model_path):
+    with open(model_path, "wb") as file:
+        file.write(serialize_model(lengths))
+
+
+def load_model(model_path):
+    with open(model_path, "rb") as file:
+        return deserialize_model(file.read())
+
+
+def model_id(lengths):
+    return zlib.crc32(serialize_model(lengths))
+
+
+# Bytes without a code of their own are spelled as the escape code followed by the raw byte
+def model_bit_strings(lengths):
+    bit_strings = code_bit_strings(lengths)
+    return [bit_strings.get(byte, bit_strings[ESCAPE] + format(byte, "08b")) for byte in range(256)]
+
+
+def model_decode(payload, lengths, original_size, output):
+    table_bits, table = lookup_table(lengths)
+    table = [entry or table[0] for entry in table]
+    window = table_bits + 8  # Room for the longest code plus an escaped byte
+    mask = (1 << table_bits) - 1
+    decoded = bytearray()
+    remaining = original_size
+    acc = nbits = 0
+
+    def step(acc, nbits):
+        symbol, length = table[(acc >> (nbits - table_bits)) & mask]
+        nbits -= length
+        if symbol == ESCAPE:
+            nbits -= 8
+            symbol = (acc >> nbits) & 0xFF
+        return symbol, nbits
+
+    for byte in payload:
+        acc = ((acc << 8) | byte) & ((1 << (window + 8)) - 1)
+        nbits += 8
+        while nbits >= window and remaining:
+            symbol, nbits = step(acc, nbits)
+            decoded.append(symbol)
+            remaining -= 1
+
+    decoded += decode_tail(acc, nbits, remaining, window, step)
+    output.write(decoded)
+
+
+def compress_with_model(input_path, output_path, lengths, cache_dir=CACHE_DIR):
+    size = 0
+
+    def counted(chunks):
+        nonlocal size
+        for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+
+    with open(output_path, "wb") as output:
+        output.write(SHARED_HEADER.pack(SHARED_MAGIC, model_id(lengths), 0))
+        encode_chunks(counted(iter_book_bytes(input_path, cache_dir)), model_bit_strings(lengths), output)
+        output.seek(0)
+        output.write(SHARED_HEADER.pack(SHARED_MAGIC, model_id(lengths), size))
+
+    return size, os.path.getsize(output_path)
+
+
+def decompress_with_model(input_path, output_path, lengths):
+    with open(input_path, "rb") as source:
+        magic, identity, original_size = SHARED_HEADER.unpack(source.read(SHARED_HEADER.size))
+        if magic != SHARED_MAGIC:
+            raise ValueError("Not a shared-model Huffman file")
+        if identity != model_id(lengths):
+            raise ValueError("File was compressed with a different model")
+        payload = source.read()
+
+    with open(output_path, "wb") as output:
+        model_decode(payload, lengths, original_size, output)
+
+    return original_size
+
+
+def benchmark_shared_model(file_paths, training_paths=None):
+    lengths = train_model(training_paths or file_paths)
+    documents = [b"".join(bytes(chunk) for chunk in iter_book_bytes(file_path)) for file_path in file_paths]
+    original = sum(len(document) for document in documents)
+
+    start = time.perf_counter()
+    per_file = []
+    for document in documents:
+        output = BytesIO()
+        own_lengths = code_lengths(calculate_frequency(document))
+        write_header(output, len(document), own_lengths)
+        encode_chunks([document], code_bit_strings(own_lengths), output)
+        per_file.append(output.getvalue())
+    per_file_time = time.perf_counter() - start
+
+    bit_strings = model_bit_strings(lengths)
+    start = time.perf_counter()
+    shared = []
+    for document in documents:
+        output = BytesIO()
+        output.write(SHARED_HEADER.pack(SHARED_MAGIC, model_id(lengths), len(document)))
+        encode_chunks([document], bit_strings, output)
+        shared.append(output.getvalue())
+    shared_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for compressed, document in zip(per_file, documents):
+        source = BytesIO(compressed)
+        size, own_lengths = read_header(source)
+        decoded = BytesIO()
+        decode_chunks([source.read()], own_lengths, size, decoded)
+        assert decoded.getvalue() == document
+    per_file_decode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for compressed, document in zip(shared, documents):
+        decoded = BytesIO()
+        model_decode(compressed[SHARED_HEADER.size:], lengths, len(document), decoded)
+        assert decoded.getvalue() == document
+    shared_decode_time = time.perf_counter() - start
+
+    megabytes = original / 1e6
+    shared_bytes = len(serialize_model(lengths)) + sum(len(compressed) for compressed in shared)
+    print(f"Original: {original} bytes in {len(documents)} files")
+    print(f"Per-file trees: {sum(len(compressed) for compressed in per_file)} bytes, "
+          f"encode {megabytes / per_file_time:.2f} MB/s, decode {megabytes / per_file_decode_time:.2f} MB/s")
+    print(f"Shared model: {shared_bytes} bytes (model included once), "
+          f"encode {megabytes / shared_time:.2f} MB/s, decode {megabytes / shared_decode_time:.2f} MB/s")
+
+
+STAGES = ("read", "frequency", "tree", "encode")
+
+
+def timed(chunks, timings, stage):
+    chunks = iter(chunks)
+    while True:
+        start = time.perf_counter()
+        chunk = next(chunks, None)
+        timings[stage] += time.perf_counter() - start
+        if chunk is None:
+            return
+        yield chunk
+
+
+def compress_job(file_path, output_path, cache_dir=CACHE_DIR):
+    stats = {"file": file_path, "output": output_path, "original_bytes": 0, "compressed_bytes": 0,
+             "ratio": None, "error": None}
+    timings = dict.fromkeys(STAGES, 0.0)
+    start = time.perf_counter()
 
-def read_html(file_path):
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            soup = BeautifulSoup(file, "html.parser")
-            return soup.get_text(separator="\n")
+        # Pass 1 streams the book into the histogram; reading time is split out from counting time
+        histogram = np.zeros(256, dtype=np.int64)
+        for chunk in timed(iter_book_bytes(file_path, cache_dir), timings, "read"):
+            stage_start = time.perf_counter()
+            histogram += byte_histogram(chunk)
+            timings["frequency"] += time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        lengths = code_lengths(histogram_to_map(histogram))
+        timings["tree"] = time.perf_counter() - stage_start
+
+        # Pass 2 streams the book again into the encoder, so memory stays at one chunk per worker
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        stage_start = time.perf_counter()
+        read_before = timings["read"]
+        with open(output_path, "wb") as output:
+            write_header(output, int(histogram.sum()), lengths)
+            encode_chunks(timed(iter_book_bytes(file_path, cache_dir), timings, "read"), code_bit_strings(lengths), output)
+        timings["encode"] = time.perf_counter() - stage_start - (timings["read"] - read_before)
+
+        stats["original_bytes"] = int(histogram.sum())
+        stats["compressed_bytes"] = os.path.getsize(output_path)
+        if stats["original_bytes"]:
+            stats["ratio"] = stats["original_bytes"] / stats["compressed_bytes"]
     except Exception as e:
-        print(f"Error reading {file_path}: {e}")
-        return None
+        stats["error"] = str(e)
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["bytes_per_sec"] = stats["original_bytes"] / stats["seconds"] if stats["seconds"] else 0.0
+    stats.update({f"{stage}_seconds": timings[stage] for stage in STAGES})
+    return stats
+
+
+def output_paths(file_paths, output_dir):
+    # Mirror each file's path relative to the corpus root, so equal basenames in different folders do not collide
+    absolute = [os.path.abspath(file_path) for file_path in file_paths]
+    root = os.path.commonpath([os.path.dirname(path) for path in absolute]) if absolute else ""
+    seen = set()
+    for path in absolute:
+        output_path = os.path.join(output_dir, os.path.relpath(path, root) + ".huf")
+        candidate, copy = output_path, 1
+        while candidate in seen:  # The same file listed twice
+            candidate = f"{output_path[:-4]}.{copy}.huf"
+            copy += 1
+        seen.add(candidate)
+        yield candidate
+
+
+def compress_corpus(file_paths, output_dir, workers=None, max_pending=None, cache_dir=CACHE_DIR):
+    file_paths = list(file_paths)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    files = []
+    start = time.perf_counter()
+
+    # The read -> frequency -> tree -> encode stages run back to back inside each job instead of
+    # as separate workers joined by bounded queues: handing chunks between processes would pickle
+    # every byte of the corpus twice, while a fused job streams it from disk and keeps only one
+    # chunk in memory. The one bounded queue is the job queue below; only max_pending jobs are
+    # queued at a time, so huge corpora do not pile up in memory. Per-stage times are still
+    # measured inside each job.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for file_path, output_path in zip(file_paths, output_paths(file_paths, output_dir)):
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                files.extend(future.result() for future in done)
+            pending.add(pool.submit(compress_job, file_path, output_path, cache_dir))
+        files.extend(future.result() for future in wait(pending)[0])
+
+    files.sort(key=lambda stats: stats["file"])
+    elapsed = time.perf_counter() - start
+    original = sum(stats["original_bytes"] for stats in files)
+    compressed = sum(stats["compressed_bytes"] for stats in files if stats["original_bytes"])
+
+    summary = {"files": len(files),
+               "failed": sum(1 for stats in files if stats["error"]),
+               "original_bytes": original,
+               "compressed_bytes": compressed,
+               "ratio": original / compressed if compressed else None,
+               "seconds": elapsed,
+               "bytes_per_sec": original / elapsed if elapsed else 0.0}
+    summary.update({f"{stage}_seconds": sum(stats[f"{stage}_seconds"] for stats in files) for stage in STAGES})
+
+    return {"summary": summary, "files": files}
+
+
+def write_report(report, report_path):
+    if report_path.endswith(".json"):
+        with open(report_path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        return
+
+    fields = list(report["files"][0]) if report["files"] else ["file"]
+    with open(report_path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(report["files"])
+        writer.writerow({"file": "TOTAL", **report["summary"]})
 
 
 def read_book(file_path):
-    if file_path.endswith(".pdf"):
-        return read_pdf(file_path)
-    elif file_path.endswith(".docx"):
-        return read_docx(file_path)
-    elif file_path.endswith(".html"):
-        return read_html(file_path)
-    elif file_path.endswith(".txt"):
-        try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                return file.read()
-        except Exception as e:
-            print(f"Error reading {file_path}: {e}")
-            return None
-    else:
-        print(f"Unsupported file format: {file_path}")
+    try:
+        return b"".join(iter_book_bytes(file_path))
+    except Exception as e:
+        print(f"Error reading {file_path}: {e}")
         return None
 
 
@@ -127,7 +965,7 @@ def main(file_paths):
                 compression_ratio = calculate_compression_ratio(
                     book_content, compressed_string
                 )
-                print(f"Original size: {len(book_content)} characters")
+                print(f"Original size: {len(book_content)} bytes")
                 print(f"Compressed size: {len(compressed_string)} bits")
                 print(f"Compression Ratio: {compression_ratio:.2f}")
             else:
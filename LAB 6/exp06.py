@@ -1,8 +1,21 @@
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
 # Interface for LCS Calculation Algorithm
 class LCSAlgorithm:
     def calculate(self, sequence1, sequence2):
         pass
 
+    def length(self, sequence1, sequence2):
+        """Compute only the length of the LCS between two sequences."""
+        return len(self.calculate(sequence1, sequence2))
+
 
 # Dynamic Programming based LCS Calculation
 class DPLCS(LCSAlgorithm):
@@ -37,6 +50,112 @@ class DPLCS(LCSAlgorithm):
         return ''.join(reversed(lcs_sequence))
 
 
+# Linear-space LCS Calculation (Hirschberg's divide and conquer)
+class HirschbergLCS(LCSAlgorithm):
+    def calculate(self, sequence1, sequence2):
+        """Compute the LCS between two sequences in O(m+n) memory using Hirschberg's algorithm."""
+        lcs_sequence = []
+        # Explicit stack of (sequence1 part, sequence2 part) pairs, processed left to right
+        stack = [(sequence1, sequence2)]
+        while stack:
+            a, b = stack.pop()
+            if not a or not b:
+                continue
+            if len(a) == 1:
+                if a[0] in b:
+                    lcs_sequence.append(a[0])
+                continue
+
+            # Split sequence1 in half and find where the LCS crosses it in sequence2
+            mid = len(a) // 2
+            forward = self.last_row(a[:mid], b)
+            backward = self.last_row(a[mid:][::-1], b[::-1])
+            n = len(b)
+            split = max(range(n + 1), key=lambda j: forward[j] + backward[n - j])
+
+            stack.append((a[mid:], b[split:]))
+            stack.append((a[:mid], b[:split]))
+
+        return ''.join(lcs_sequence)
+
+    def length(self, sequence1, sequence2):
+        """Compute the LCS length keeping only two rolling rows of the DP table."""
+        if len(sequence2) > len(sequence1):
+            sequence1, sequence2 = sequence2, sequence1
+        return self.last_row(sequence1, sequence2)[-1]
+
+    @staticmethod
+    def last_row(sequence1, sequence2):
+        """Return the last row of the LCS DP table: LCS lengths of sequence1 against every prefix of sequence2."""
+        previous = [0] * (len(sequence2) + 1)
+        for item in sequence1:
+            current = [0]
+            for j, other in enumerate(sequence2):
+                if item == other:
+                    current.append(previous[j] + 1)
+                else:
+                    current.append(max(previous[j + 1], current[j]))
+            previous = current
+        return previous
+
+
+# Bit-parallel LCS Calculation for small alphabets (Allison-Dix / Hyyro)
+class BitParallelLCS(HirschbergLCS):
+    def length(self, sequence1, sequence2):
+        """Compute the LCS length with one big-int bitvector step per element of the shorter sequence."""
+        if len(sequence2) > len(sequence1):
+            sequence1, sequence2 = sequence2, sequence1
+        return self.last_row(sequence1, sequence2)[-1]
+
+    @staticmethod
+    def last_row(sequence1, sequence2):
+        """Return LCS lengths of sequence1 against every prefix of sequence2 using bitvectors over sequence1."""
+        m = len(sequence1)
+        full = (1 << m) - 1
+
+        # One match mask per symbol: bit i is set where sequence1[i] is that symbol
+        masks = {}
+        for i, item in enumerate(sequence1):
+            masks[item] = masks.get(item, 0) | (1 << i)
+
+        row = [0]
+        v = full  # Zero bits of v count the LCS length so far
+        for item in sequence2:
+            u = v & masks.get(item, 0)
+            v = ((v + u) | (v - u)) & full
+            row.append(m - v.bit_count())
+        return row
+
+
+def benchmark_lcs(lengths=(100, 1000, 10000, 100000), alphabet="ABCDEFO", dp_limit=3000):
+    """Time DPLCS, HirschbergLCS and BitParallelLCS on random grade sequences of each length."""
+    import random
+    import time
+
+    algorithms = [("DPLCS", DPLCS()), ("HirschbergLCS", HirschbergLCS()), ("BitParallelLCS", BitParallelLCS())]
+    print(f"{'Length':<10}" + "".join(f"{name + ' length':<26}" for name, _ in algorithms))
+
+    for size in lengths:
+        sequence1 = ''.join(random.choice(alphabet) for _ in range(size))
+        sequence2 = ''.join(random.choice(alphabet) for _ in range(size))
+        row = f"{size:<10}"
+        expected = None
+
+        for name, algorithm in algorithms:
+            # The quadratic pure-Python tables are skipped once they would take too long
+            if size > dp_limit and not isinstance(algorithm, BitParallelLCS):
+                row += f"{'skipped':<26}"
+                continue
+            start = time.perf_counter()
+            result = algorithm.length(sequence1, sequence2)
+            elapsed = time.perf_counter() - start
+            assert expected is None or result == expected
+            expected = result
+            row += f"{elapsed:<26.4f}"
+
+        print(row)
+
+
 # Validator for Grade Sequences
 class GradeSequenceValidator:
     @staticmethod
@@ -75,6 +194,201 @@ class LCSCalculator:
         return common_sequence if common_sequence else "No common subsequence found"
 
 
+# Computes one pairwise LCS (module level so worker processes can run it)
+def pairwise_lcs(algorithm, sequence1, sequence2):
+    return algorithm.calculate(sequence1, sequence2)
+
+
+# LRU cache of pairwise LCS results keyed by the hashes of both sequences
+class LCSCache:
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+
+    @staticmethod
+    def key(algorithm, sequence1, sequence2):
+        """Build the cache key from the algorithm and the SHA-1 of each sequence (order matters)."""
+        digest1 = hashlib.sha1(str(sequence1).encode("utf-8")).digest()
+        digest2 = hashlib.sha1(str(sequence2).encode("utf-8")).digest()
+        return type(algorithm).__name__, digest1, digest2
+
+    def get(self, key):
+        if key not in self.entries:
+            return None
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
+# LCS Calculator that reduces the sequences as a balanced tree across a process pool
+class ParallelLCSCalculator(LCSCalculator):
+    def __init__(self, algorithm: LCSAlgorithm, workers=None, cache=None):
+        super().__init__(algorithm)
+        self.workers = workers
+        self.cache = cache if cache is not None else LCSCache()
+        self.pool = None
+
+    def find_lcs(self, grade_sequences):
+        """Compute the LCS among a list of grade sequences by reducing neighbouring pairs level by level."""
+        validation_error = GradeSequenceValidator.validate(grade_sequences)
+        if validation_error:
+            return validation_error
+
+        level = list(grade_sequences)
+        try:
+            while len(level) > 1:
+                # Neighbours are paired in input order (left argument first), so ties resolve as in find_lcs
+                pairs = [(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+                level = self.reduce_pairs(pairs) + level[len(pairs) * 2:]
+                if not all(level):  # Exit early if there's no common subsequence left
+                    return "No common subsequence found"
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+                self.pool = None
+
+        return level[0]
+
+    def worker_pool(self):
+        """Return the process pool, starting it the first time uncached work needs it."""
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self.pool
+
+    def reduce_pairs(self, pairs):
+        """Return the LCS of each pair, serving identical and cached pairs without recomputing them."""
+        results = [None] * len(pairs)
+        missing = {}
+
+        for i, (sequence1, sequence2) in enumerate(pairs):
+            if sequence1 == sequence2:
+                results[i] = sequence1
+                continue
+            key = self.cache.key(self.algorithm, sequence1, sequence2)
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                missing.setdefault(key, []).append(i)
+
+        keys = list(missing)
+        first = [pairs[missing[key][0]] for key in keys]
+        if len(keys) > 1 and self.workers != 1:
+            computed = self.worker_pool().map(pairwise_lcs, [self.algorithm] * len(keys),
+                                [pair[0] for pair in first], [pair[1] for pair in first])
+        else:
+            computed = (self.algorithm.calculate(sequence1, sequence2) for sequence1, sequence2 in first)
+
+        for key, value in zip(keys, computed):
+            self.cache.put(key, value)
+            for i in missing[key]:
+                results[i] = value
+
+        return results
+
+
+# LCS lengths of one sequence against a batch of padded sequences, vectorized over anti-diagonals
+def batch_lcs_lengths(sequence, batch):
+    """Return LCS lengths of an encoded sequence against every row of a padded (k x n) batch."""
+    m, (k, n) = len(sequence), batch.shape
+    if m == 0 or n == 0:
+        return np.zeros(k, dtype=np.int32)
+
+    # Cell (i, j) lives at index i of diagonal i + j; each diagonal only needs the previous two
+    before_previous = np.zeros((k, m + 1), dtype=np.int32)
+    previous = np.zeros((k, m + 1), dtype=np.int32)
+    for d in range(2, m + n + 1):
+        current = np.zeros((k, m + 1), dtype=np.int32)
+        rows = np.arange(max(1, d - n), min(m, d - 1) + 1)
+        match = sequence[rows - 1] == batch[:, d - rows - 1]
+        current[:, rows] = np.where(match, before_previous[:, rows - 1] + 1,
+                                    np.maximum(previous[:, rows - 1], previous[:, rows]))
+        before_previous, previous = previous, current
+
+    return previous[:, m]
+
+
+# Encoded sequences shared by every similarity_rows call in a process; set once per worker
+# by the pool initializer so the arrays are not pickled into each submitted block
+similarity_inputs = {}
+
+
+def set_similarity_inputs(codes, lengths):
+    similarity_inputs["codes"] = codes
+    similarity_inputs["lengths"] = lengths
+
+
+# Fills the upper-triangle part of rows [start, stop) of the memory-mapped similarity matrix
+# (runs in a worker process); every write is a contiguous slice of one row
+def similarity_rows(matrix_path, size, start, stop, batch_size):
+    codes, lengths = similarity_inputs["codes"], similarity_inputs["lengths"]
+    matrix = np.memmap(matrix_path, dtype=np.int32, mode="r+", shape=(size, size))
+    for i in range(start, stop):
+        sequence = codes[i, :lengths[i]]
+        matrix[i, i] = lengths[i]
+        for first in range(i + 1, size, batch_size):
+            last = min(first + batch_size, size)
+            width = int(lengths[first:last].max())
+            matrix[i, first:last] = batch_lcs_lengths(sequence, codes[first:last, :width])
+    matrix.flush()
+
+
+# Copies the upper triangle into the lower one tile by tile, so each transpose touches
+# tile-sized runs of rows instead of one element per row
+def mirror_upper_triangle(matrix, tile=512):
+    size = len(matrix)
+    for top in range(0, size, tile):
+        bottom = min(top + tile, size)
+        for left in range(top, size, tile):
+            right = min(left + tile, size)
+            block = np.array(matrix[top:bottom, left:right])
+            if left == top:
+                matrix[top:bottom, left:right] = np.where(np.tri(bottom - top, dtype=bool), block.T, block)
+            else:
+                matrix[left:right, top:bottom] = block.T
+    matrix.flush()
+
+
+def lcs_similarity_matrix(sequences, matrix_path=None, workers=None, block_rows=16, batch_size=256):
+    """Compute the n x n matrix of pairwise LCS lengths into a memory-mapped int32 file."""
+    size = len(sequences)
+    if size == 0:
+        return np.zeros((0, 0), dtype=np.int32)
+    if matrix_path is None:
+        handle, matrix_path = tempfile.mkstemp(suffix=".lcs")
+        os.close(handle)
+
+    # Encode symbols as small integers; padding (-1) never matches a real symbol
+    symbols = {}
+    lengths = np.array([len(sequence) for sequence in sequences], dtype=np.int64)
+    codes = np.full((size, int(lengths.max())), -1, dtype=np.int32)
+    for i, sequence in enumerate(sequences):
+        codes[i, :len(sequence)] = [symbols.setdefault(item, len(symbols)) for item in sequence]
+
+    np.memmap(matrix_path, dtype=np.int32, mode="w+", shape=(size, size)).flush()
+
+    blocks = [(start, min(start + block_rows, size)) for start in range(0, size, block_rows)]
+    if len(blocks) <= 1 or workers == 1:
+        set_similarity_inputs(codes, lengths)
+        for start, stop in blocks:
+            similarity_rows(matrix_path, size, start, stop, batch_size)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=set_similarity_inputs,
+                                 initargs=(codes, lengths)) as pool:
+            futures = [pool.submit(similarity_rows, matrix_path, size, start, stop, batch_size)
+                       for start, stop in blocks]
+            for future in futures:
+                future.result()
+
+    mirror_upper_triangle(np.memmap(matrix_path, dtype=np.int32, mode="r+", shape=(size, size)))
+    return np.memmap(matrix_path, dtype=np.int32, mode="r", shape=(size, size))
+
+
 # Example Usage
 students_grades = [
     "",   # Valid grade sequence
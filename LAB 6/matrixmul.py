@@ -1,4 +1,7 @@
 import sys
+import time
+
+import numpy as np
 
 def matrix_chain_order(dimensions):
     """
@@ -59,6 +62,94 @@ def print_optimal_parenthesization(s, i, j):
         print_optimal_parenthesization(s, s[i][j] + 1, j)  # Right split
         print(")", end="")
 
+def matrix_chain_order_vectorized(dimensions):
+    """
+    Matrix Chain Multiplication DP with the inner split loop vectorized in NumPy.
+    
+    For each chain length, every (i, k) candidate is evaluated in one array operation,
+    and the first minimal split is kept, so the tables match matrix_chain_order exactly.
+    The O(n log n) Hu-Shing algorithm is not offered as an alternative: it finds the optimal cost
+    and one optimal parenthesization of the whole chain, but not the dp and s entries of every
+    subchain with matrix_chain_order's first-minimum tie-breaking, which callers of these tables need.
+    
+    Args:
+    - dimensions: A list of dimensions representing the matrices in the chain.
+    
+    Returns:
+    - dp: A table containing the minimum number of scalar multiplications.
+    - s: A table containing the optimal split point for matrix chain multiplication.
+    """
+    # Check if dimensions list is valid
+    if not dimensions or len(dimensions) < 2:
+        raise ValueError("Matrix dimensions list must contain at least two values representing matrix chains.")
+    
+    # Check for non-numeric dimensions
+    if any(not isinstance(d, int) or d <= 0 for d in dimensions):
+        raise ValueError("Matrix dimensions must be positive integers.")
+
+    n = len(dimensions) - 1  # Number of matrices
+
+    # Costs are bounded by n * max(d)^3; fall back to Python integers if that would overflow int64
+    if n * max(dimensions) ** 3 >= 2 ** 63:
+        return matrix_chain_order(dimensions)
+
+    d = np.array(dimensions, dtype=np.int64)
+    dp = np.zeros((n, n), dtype=np.int64)
+    dp_t = np.zeros((n, n), dtype=np.int64)  # Transposed copy so dp[k+1][j] reads along a row
+    s = np.zeros((n, n), dtype=np.int64)
+
+    as_strided = np.lib.stride_tricks.as_strided
+    step = dp.strides[1]
+
+    for length in range(2, n + 1):
+        rows = n - length + 1
+        i = np.arange(rows)
+        j = i + length - 1
+
+        # Strided views (no copies) with one row per chain i and one column per split k = i + t:
+        # left[i, t] = dp[i][k], right[i, t] = dp[k+1][j], middle[i, t] = dimensions[k+1]
+        left = as_strided(dp, shape=(rows, length - 1), strides=((n + 1) * step, step))
+        right = as_strided(dp_t.reshape(-1)[(length - 1) * n + 1:], shape=(rows, length - 1),
+                           strides=((n + 1) * step, step))
+        middle = as_strided(d[1:], shape=(rows, length - 1), strides=(step, step))
+
+        q = left + right
+        q += (d[i] * d[j + 1])[:, None] * middle
+        best = np.argmin(q, axis=1)  # first minimum, like the strict < in matrix_chain_order
+
+        cost = q[np.arange(len(i)), best]
+        dp[i, j] = cost
+        dp_t[j, i] = cost
+        s[i, j] = i + best
+
+    return dp.tolist(), s.tolist()
+
+def benchmark_matrix_chain(sizes=(100, 250, 500, 1000, 2000), loop_limit=500):
+    """
+    Times matrix_chain_order against matrix_chain_order_vectorized on random chains.
+    
+    Args:
+    - sizes: Numbers of matrices in each benchmarked chain.
+    - loop_limit: Largest chain still timed with the pure-Python triple loop.
+    """
+    import random
+
+    for n in sizes:
+        dimensions = [random.randint(1, 1000) for _ in range(n + 1)]
+
+        start = time.perf_counter()
+        fast = matrix_chain_order_vectorized(dimensions)
+        vectorized_time = time.perf_counter() - start
+
+        if n <= loop_limit:
+            start = time.perf_counter()
+            assert matrix_chain_order(dimensions) == fast
+            loop_time = f"{time.perf_counter() - start:.3f} s"
+        else:
+            loop_time = "skipped"
+
+        print(f"n = {n}: triple loop {loop_time}, vectorized {vectorized_time:.3f} s")
+
 # Positive Test Cases
 positive_test_cases = [
     ([10, 20, 30, 40], "Test Case 1"),